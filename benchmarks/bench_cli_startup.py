@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+CLI cold-start benchmark
+
+Measures wall time of fresh interpreter invocations of the CLI and reports
+which heavy modules each subcommand pulls in on import.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("numpy", "torch", "torchmetrics")
+
+SAMPLE_TRACE = (
+    "BlockStat: POC 0 @(   0,   0) [ 8x 8] QP=22\n"
+    "BlockStat: POC 1 @(   8,   8) [ 8x 8] MVL0={-4, 12}\n"
+)
+
+
+def cases(trace: str) -> dict:
+    return {
+        "python": [sys.executable, "-c", "pass"],
+        "--help": [sys.executable, "-m", "cli.main", "--help"],
+        "status": [sys.executable, "-m", "cli.main", "status"],
+        "parse": [sys.executable, "-m", "cli.main", "parse", trace],
+    }
+
+
+def time_command(cmd, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_imports(argv: list) -> list:
+    """Heavy modules loaded after running the CLI in-process with `argv`."""
+    probe = (
+        "import contextlib, io, sys, cli.main\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        f"    cli.main.main({argv!r})\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    return [m for m in out.split(",") if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace = str(Path(tmp) / "trace.csv")
+        Path(trace).write_text(SAMPLE_TRACE)
+
+        for name, cmd in cases(trace).items():
+            timings = time_command(cmd, args.runs)
+            print(
+                f"{name:<10} median {statistics.median(timings) * 1000:8.1f} ms  "
+                f"min {min(timings) * 1000:8.1f} ms  ({args.runs} runs)"
+            )
+
+        for argv in (["status"], ["parse", trace]):
+            loaded = heavy_imports(argv)
+            print(f"heavy modules loaded by {argv[0]}: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Command line entry point.
+
+Only the standard library (and the stdlib-only profiling hooks) is imported
+at module level. Every subcommand imports the modules it needs inside its
+handler, so trivial invocations (`status`, `--help`) and short `parse` jobs
+do not pay for numpy/torch imports they never use.
+"""
+
+import argparse
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from profiling.profiler import PROFILER
+
+
+DEFAULT_ENCODED_DIR = "./output/encoded"
+DEFAULT_DECODED_DIR = "./output/decoded"
+DEFAULT_FEATURES_DIR = "./output/features"
+
+
+def _apply_execution_args(cfg, args: argparse.Namespace):
+    if args.workers is not None:
+        cfg.max_workers = args.workers
+    if args.memory_budget_mb is not None:
+        cfg.memory_budget_mb = args.memory_budget_mb
+    if args.memory_history is not None:
+        cfg.memory_history = args.memory_history
+
+
+def _encoder_config(args: argparse.Namespace):
+    from encoder.config import Config
+
+    cfg = Config()
+    cfg.data_dir = args.data_dir
+    cfg.output_dir = args.output_dir
+    if args.qp:
+        cfg.qp = args.qp
+    if args.frames is not None:
+        cfg.frames_to_encode = args.frames
+    if args.preset is not None:
+        cfg.preset = args.preset
+    if args.no_recon:
+        cfg.write_recon = False
+    _apply_execution_args(cfg, args)
+    return cfg
+
+
+def _decoder_config(args: argparse.Namespace, bitstreams: List[str]):
+    from decoder.config import Config
+
+    cfg = Config(
+        bitstream_input=bitstreams,
+        output_path=args.decoded_dir,
+        verify_recon=args.verify_recon,
+    )
+    _apply_execution_args(cfg, args)
+    return cfg
+
+
+def _run_encode(args: argparse.Namespace) -> List[str]:
+    from encoder.encoders import VVencEncoder
+    from encoder.manager import EncoderManager
+
+    encoder = VVencEncoder(executable=args.encoder) if args.encoder else VVencEncoder()
+    return EncoderManager(_encoder_config(args), encoder).run()
+
+
+def _run_decode(args: argparse.Namespace, bitstreams: List[str]):
+    from decoder.decoders import VTMDecoder
+    from decoder.manager import DecoderManager
+
+    decoder = VTMDecoder(executable=args.decoder) if args.decoder else VTMDecoder()
+    DecoderManager(_decoder_config(args, bitstreams), decoder=decoder).run()
+
+
+def cmd_encode(args: argparse.Namespace) -> int:
+    _run_encode(args)
+    return 0
+
+
+def cmd_decode(args: argparse.Namespace) -> int:
+    bitstreams = args.bitstreams or sorted(
+        str(p) for p in Path(args.output_dir).glob("*.vvc")
+    )
+    if not bitstreams:
+        print(f"No bitstreams found in {args.output_dir}", file=sys.stderr)
+        return 1
+    _run_decode(args, bitstreams)
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    bitstreams = _run_encode(args)
+    _run_decode(args, bitstreams)
+    return 0
+
+
+def cmd_parse(args: argparse.Namespace) -> int:
+    from features_parser.parser import VTMParser
+
+    grouped = VTMParser().parse_file(args.trace)
+    for poc, tokens in grouped.items():
+        counts = Counter(t.param for t in tokens)
+        summary = " ".join(f"{param}={n}" for param, n in sorted(counts.items()))
+        print(f"POC {poc}: {len(tokens)} tokens {summary}")
+    return 0
+
+
+def cmd_features(args: argparse.Namespace) -> int:
+    import numpy as np
+
+    from features_generator.generator import DEFAULT_CHANNELS, SequenceFeatureBuilder
+    from features_parser.parser import VTMParser
+
+    channels = args.channels or list(DEFAULT_CHANNELS)
+    builder = SequenceFeatureBuilder(
+        args.width, args.height, channels=channels, dtype=np.dtype(args.dtype)
+    )
+    grouped = VTMParser().parse_file(args.trace)
+    tensor = builder.build(grouped, num_frames=args.frames, out_path=args.output)
+    print(f"{args.output}: {tensor.shape} {tensor.dtype}")
+
+    if args.derived:
+        from features_generator.derived import DerivedFeatureGenerator
+
+        derived = DerivedFeatureGenerator(channels).generate(
+            tensor, args.derived, full_resolution=not args.block_grid
+        )
+        derived_path = Path(args.output).with_suffix(".derived.npy")
+        np.save(derived_path, derived)
+        print(f"{derived_path}: {derived.shape} {derived.dtype}")
+    return 0
+
+
+def cmd_extract(args: argparse.Namespace) -> int:
+    from features_generator.config import Config
+    from features_generator.manager import FeatureManager
+
+    traces = args.traces or sorted(str(p) for p in Path(args.decoded_dir).glob("*.csv"))
+    if not traces:
+        print(f"No traces found in {args.decoded_dir}", file=sys.stderr)
+        return 1
+
+    cfg = Config(
+        trace_input=traces,
+        output_path=args.features_dir,
+        metadata_dir=args.output_dir,
+        width=args.width,
+        height=args.height,
+        frames=args.frames,
+        dtype=args.dtype,
+    )
+    if args.channels:
+        cfg.channels = args.channels
+    if args.workers is not None:
+        cfg.max_workers = args.workers
+    FeatureManager(cfg).run()
+    return 0
+
+
+def cmd_metrics(args: argparse.Namespace) -> int:
+    from metrics.psnr import luma_psnr_per_frame
+
+    results = luma_psnr_per_frame(args.reference, args.distorted, args.width, args.height)
+    for frame, value in results:
+        print(f"frame {frame}: Y-PSNR {value:.4f} dB")
+    if results:
+        finite = [v for _, v in results if v != float("inf")]
+        mean = sum(finite) / len(finite) if finite else float("inf")
+        identical = len(results) - len(finite)
+        print(
+            f"mean: Y-PSNR {mean:.4f} dB over {len(finite)} frames "
+            f"({identical} identical frames excluded)"
+        )
+    return 0
+
+
+def cmd_verify(args: argparse.Namespace) -> int:
+    from metrics.recon import compare_reconstructions
+
+    result = compare_reconstructions(
+        args.reference, args.candidate, args.width, args.height
+    )
+    for frame in result.mismatched_frames:
+        print(f"frame {frame}: mismatch")
+    print(
+        f"{'identical' if result.identical else 'mismatch'}: "
+        f"{result.frames_reference} vs {result.frames_candidate} frames, "
+        f"{len(result.mismatched_frames)} mismatched"
+    )
+    return 0 if result.identical else 1
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    encoded = Path(args.output_dir)
+    decoded = Path(args.decoded_dir)
+    rows = [
+        ("sources", Path(args.data_dir), "*.yuv"),
+        ("bitstreams", encoded, "*.vvc"),
+        ("encoder recons", encoded, "*_rec.yuv"),
+        ("decoder recons", decoded, "*_vtm_rec.yuv"),
+        ("traces", decoded, "*.csv"),
+    ]
+    for label, directory, pattern in rows:
+        count = len(list(directory.glob(pattern))) if directory.is_dir() else 0
+        print(f"{label:<15} {count:>5}  {directory / pattern}")
+    return 0
+
+
+def _add_paths(parser: argparse.ArgumentParser):
+    parser.add_argument("--data-dir", default="./data")
+    parser.add_argument("--output-dir", default=DEFAULT_ENCODED_DIR)
+    parser.add_argument("--decoded-dir", default=DEFAULT_DECODED_DIR)
+
+
+def _add_encode_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--encoder", help="Path to vvencFFapp")
+    parser.add_argument("--qp", type=int, nargs="+")
+    parser.add_argument("--frames", type=int)
+    parser.add_argument("--preset")
+    parser.add_argument(
+        "--no-recon", action="store_true", help="Do not write the vvenc reconstruction"
+    )
+
+
+def _add_execution_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--workers", type=int)
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=int,
+        help="Admit jobs only while their estimated memory fits in this budget",
+    )
+    parser.add_argument(
+        "--memory-history", help="JSON file with observed peak RSS corrections"
+    )
+
+
+def _add_decode_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--decoder", help="Path to DecoderAnalyserApp")
+    parser.add_argument(
+        "--verify-recon",
+        action="store_true",
+        help="Compare vvenc and VTM reconstructions, keep only the VTM one if equal",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="vvc-cnn", description="VVC inter enhancement dataset pipeline"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["timers", "cprofile"],
+        help="Collect stage timings and counters (same as VVC_PROFILE)",
+    )
+    parser.add_argument(
+        "--profile-report", help="Write the profiling report as JSON to this path"
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="Encode sources, then decode the bitstreams")
+    _add_paths(run)
+    _add_encode_args(run)
+    _add_decode_args(run)
+    _add_execution_args(run)
+    run.set_defaults(func=cmd_run)
+
+    encode = sub.add_parser("encode", help="Encode sources with vvenc")
+    _add_paths(encode)
+    _add_encode_args(encode)
+    _add_execution_args(encode)
+    encode.set_defaults(func=cmd_encode)
+
+    decode = sub.add_parser("decode", help="Decode bitstreams with VTM tracing")
+    _add_paths(decode)
+    _add_decode_args(decode)
+    decode.add_argument("bitstreams", nargs="*")
+    _add_execution_args(decode)
+    decode.set_defaults(func=cmd_decode)
+
+    parse = sub.add_parser("parse", help="Summarise tokens of a VTM trace")
+    parse.add_argument("trace")
+    parse.set_defaults(func=cmd_parse)
+
+    features = sub.add_parser("features", help="Build a feature tensor from a trace")
+    features.add_argument("trace")
+    features.add_argument("output", help="Output .npy path")
+    features.add_argument("--width", type=int, required=True)
+    features.add_argument("--height", type=int, required=True)
+    features.add_argument("--frames", type=int)
+    features.add_argument("--channels", nargs="+")
+    features.add_argument(
+        "--dtype", choices=["float32", "float16", "int16"], default="float32"
+    )
+    features.add_argument("--derived", nargs="+", help="Derived channels to compute")
+    features.add_argument(
+        "--block-grid",
+        action="store_true",
+        help="Store derived channels at 4x4 block grid instead of full resolution",
+    )
+    features.set_defaults(func=cmd_features)
+
+    extract = sub.add_parser(
+        "extract", help="Build feature tensors of many traces in parallel"
+    )
+    _add_paths(extract)
+    extract.add_argument("traces", nargs="*")
+    extract.add_argument("--features-dir", default=DEFAULT_FEATURES_DIR)
+    extract.add_argument("--width", type=int)
+    extract.add_argument("--height", type=int)
+    extract.add_argument("--frames", type=int)
+    extract.add_argument("--channels", nargs="+")
+    extract.add_argument(
+        "--dtype", choices=["float32", "float16", "int16"], default="float32"
+    )
+    extract.add_argument("--workers", type=int)
+    extract.set_defaults(func=cmd_extract)
+
+    metrics = sub.add_parser("metrics", help="Per-frame Y-PSNR of a reconstruction")
+    metrics.add_argument("reference")
+    metrics.add_argument("distorted")
+    metrics.add_argument("--width", type=int, required=True)
+    metrics.add_argument("--height", type=int, required=True)
+    metrics.set_defaults(func=cmd_metrics)
+
+    verify = sub.add_parser(
+        "verify", help="Compare two reconstructions frame by frame"
+    )
+    verify.add_argument("reference")
+    verify.add_argument("candidate")
+    verify.add_argument("--width", type=int, required=True)
+    verify.add_argument("--height", type=int, required=True)
+    verify.set_defaults(func=cmd_verify)
+
+    status = sub.add_parser("status", help="Show pipeline artefact counts")
+    _add_paths(status)
+    status.set_defaults(func=cmd_status)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    if args.profile:
+        PROFILER.configure(use_cprofile=args.profile == "cprofile")
+    try:
+        return args.func(args)
+    finally:
+        PROFILER.write_report(args.profile_report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+
+from cli.main import main
+from profiling.profiler import PROFILER
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TRACE = (
+    "BlockStat: POC 0 @(   0,   0) [ 8x 8] QP=22\n"
+    "BlockStat: POC 1 @(   0,   0) [ 8x 8] QP=27\n"
+    "BlockStat: POC 1 @(   8,   8) [ 8x 8] MVL0={-4, 12}\n"
+)
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.trace = self.dir / "seq.csv"
+        self.trace.write_text(TRACE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            code = main(list(argv))
+        return code, out.getvalue()
+
+    def test_import_is_lightweight(self):
+        probe = (
+            "import contextlib, io, sys, cli.main\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            f"    cli.main.main(['parse', {str(self.trace)!r}])\n"
+            "print([m for m in ('numpy', 'torch', 'torchmetrics', 'yaml') "
+            "if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_parse(self):
+        code, out = self.run_cli("parse", str(self.trace))
+
+        self.assertEqual(code, 0)
+        self.assertIn("POC 0: 1 tokens QP=1", out)
+        self.assertIn("POC 1: 2 tokens MVL0=1 QP=1", out)
+
+    def test_features(self):
+        output = self.dir / "seq.npy"
+        code, _ = self.run_cli(
+            "features",
+            str(self.trace),
+            str(output),
+            "--width", "16",
+            "--height", "16",
+            "--channels", "QP", "MVL0_X", "MVL0_Y",
+            "--derived", "MVL0_MAG",
+        )
+
+        self.assertEqual(code, 0)
+        tensor = np.load(output)
+        self.assertEqual(tensor.shape, (2, 3, 16, 16))
+        self.assertEqual(tensor[1, 2, 12, 12], 12.0)
+        derived = np.load(self.dir / "seq.derived.npy")
+        self.assertEqual(derived.shape, (2, 1, 16, 16))
+
+    def test_metrics(self):
+        frame = np.full(16 * 16 * 3 // 2, 100, dtype=np.uint8)
+        ref, dist = self.dir / "ref.yuv", self.dir / "dist.yuv"
+        np.concatenate([frame, frame]).tofile(ref)
+        distorted = frame.copy()
+        distorted[0] = 110
+        np.concatenate([frame, distorted]).tofile(dist)
+
+        code, out = self.run_cli(
+            "metrics", str(ref), str(dist), "--width", "16", "--height", "16"
+        )
+
+        self.assertEqual(code, 0)
+        self.assertIn("frame 0: Y-PSNR inf dB", out)
+        self.assertIn("frame 1: Y-PSNR", out)
+        self.assertIn("over 1 frames (1 identical frames excluded)", out)
+
+    def test_status(self):
+        code, out = self.run_cli(
+            "status", "--output-dir", str(self.dir), "--decoded-dir", str(self.dir)
+        )
+
+        self.assertEqual(code, 0)
+        self.assertRegex(out, r"traces\s+1")
+
+    def test_no_command(self):
+        code, _ = self.run_cli()
+        self.assertEqual(code, 1)
+
+    def test_profile_report(self):
+        report_path = self.dir / "profile.json"
+        try:
+            code, _ = self.run_cli(
+                "--profile",
+                "timers",
+                "--profile-report",
+                str(report_path),
+                "parse",
+                str(self.trace),
+            )
+        finally:
+            PROFILER.configure(enabled=False)
+
+        self.assertEqual(code, 0)
+        report = json.loads(report_path.read_text())
+        self.assertEqual(report["counters"]["parse.lines"], 3)
+        self.assertEqual(report["counters"]["parse.bytes_read"], len(TRACE))
+
+    def test_extract(self):
+        features_dir = self.dir / "features"
+        code, _ = self.run_cli(
+            "extract",
+            str(self.trace),
+            "--features-dir", str(features_dir),
+            "--width", "16",
+            "--height", "16",
+            "--workers", "1",
+        )
+
+        self.assertEqual(code, 0)
+        tensor = np.load(features_dir / "seq_features.npy")
+        self.assertEqual(tensor.shape[0], 2)
+
+    def test_verify(self):
+        frame = np.full(16 * 16 * 3 // 2, 100, dtype=np.uint8)
+        ref, enc = self.dir / "vtm_rec.yuv", self.dir / "enc_rec.yuv"
+        np.concatenate([frame, frame]).tofile(ref)
+        np.concatenate([frame, frame + 1]).tofile(enc)
+
+        code, out = self.run_cli(
+            "verify", str(ref), str(enc), "--width", "16", "--height", "16"
+        )
+
+        self.assertEqual(code, 1)
+        self.assertIn("frame 1: mismatch", out)
@@ -9,7 +9,10 @@ class Config:
 
     bitstream_input: List[str] = field(default_factory=list)
     output_path: str = "./output/decoded"
+    verify_recon: bool = False
     max_workers: Optional[int] = os.cpu_count()
+    memory_budget_mb: Optional[int] = None
+    memory_history: Optional[str] = None
 
 
 BASE_CONFIG = Config()
@@ -22,3 +25,7 @@ class DecodingTaskParams:
     bitstream_input: str
     output_yuv: str
     trace_file: str
+    width: int = 0
+    height: int = 0
+    frames: int = 0
+    encoder_recon: Optional[str] = None
@@ -1,10 +1,18 @@
-from concurrent.futures import ProcessPoolExecutor
+import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
 
 from decoder.config import Config, DecodingTaskParams
 from decoder.decoders import Decoder
+from metrics.recon import deduplicate_reconstruction
+from scheduler.memory import (
+    MB,
+    VTM_DECODER_MODEL,
+    MemoryBudgetScheduler,
+    MemoryEstimator,
+)
+from profiling.profiler import PROFILER
 
 
 @dataclass
@@ -20,16 +28,53 @@ class DecoderManager:
         for b in self.cfg.bitstream_input:
             b_path = Path(b)
             file_name = b_path.stem
+            metadata = self._read_metadata(b_path)
             tasks.append(
                 DecodingTaskParams(
                     bitstream_input=str(b_path),
                     output_yuv=str(self.output_path / f"{file_name}_vtm_rec.yuv"),
                     trace_file=str(self.output_path / f"{file_name}.csv"),
+                    width=metadata.get("width", 0),
+                    height=metadata.get("height", 0),
+                    frames=metadata.get("frames", 0),
+                    encoder_recon=metadata.get("recon"),
                 )
             )
 
         return tasks
 
+    def _read_metadata(self, bitstream: Path) -> dict:
+        """Reads the stream properties written by `EncoderManager`, if any."""
+        metadata_path = bitstream.with_suffix(".json")
+        if not metadata_path.is_file():
+            return {}
+        return json.loads(metadata_path.read_text())
+
+    def _verify_reconstructions(self, tasks: List[DecodingTaskParams]):
+        """
+        Checks the vvenc reconstruction of each task against the VTM one
+        and keeps only the VTM file when they match.
+        """
+        for task in tasks:
+            if not task.encoder_recon or not Path(task.encoder_recon).is_file():
+                continue
+            if not task.width or not task.height:
+                print(f"Skipping verification of {task.encoder_recon}: unknown resolution")
+                continue
+
+            comparison = deduplicate_reconstruction(
+                task.output_yuv, task.encoder_recon, task.width, task.height
+            )
+            if comparison.identical:
+                print(f"Verified {task.output_yuv}, removed {task.encoder_recon}")
+            else:
+                print(
+                    f"Encoder/decoder mismatch in {task.bitstream_input}: "
+                    f"frames {comparison.mismatched_frames} "
+                    f"({comparison.frames_candidate} encoder vs "
+                    f"{comparison.frames_reference} decoder frames)"
+                )
+
     def run(self):
         """
         Takes a list of .vvc files and generates
@@ -39,8 +84,24 @@ class DecoderManager:
 
         print(f"Starting VTM Metadata Extraction: {len(tasks)} tasks.")
 
-        with ProcessPoolExecutor(max_workers=self.cfg.max_workers) as executor:
-            results = list(executor.map(self.decoder.decode, tasks))
+        estimator = MemoryEstimator(
+            "vtm_decoder", VTM_DECODER_MODEL, history_path=self.cfg.memory_history
+        )
+        estimates = [estimator.estimate(t.width, t.height, t.frames) for t in tasks]
+        budget = self.cfg.memory_budget_mb
+        scheduler = MemoryBudgetScheduler(
+            max_workers=self.cfg.max_workers,
+            budget_bytes=budget * MB if budget else None,
+        )
+        with PROFILER.stage("decode"):
+            outcomes = scheduler.run(self.decoder.decode, tasks, estimates)
+        PROFILER.count("decode.tasks", len(tasks))
+
+        for task, outcome in zip(tasks, outcomes):
+            estimator.observe(task.width, task.height, task.frames, "", outcome.peak_rss)
+            print(outcome.result)
+        estimator.save()
 
-        for r in results:
-            print(r)
+        if self.cfg.verify_recon:
+            with PROFILER.stage("verify_recon"):
+                self._verify_reconstructions(tasks)
@@ -15,7 +15,10 @@ class Config:
     preset: str = "fast"
     alf: int = 1
     sao: int = 1
+    write_recon: bool = True
     max_workers: Optional[int] = os.cpu_count()
+    memory_budget_mb: Optional[int] = None
+    memory_history: Optional[str] = None
 
 
 BASE_CONFIG = Config()
@@ -32,7 +35,7 @@ class EncodingTaskParams:
     frames: int
     qp: int
     bitstream_out: str
-    recon_out: str
+    recon_out: Optional[str]
     preset: str
     alf: int
     sao: int
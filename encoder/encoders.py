@@ -29,7 +29,6 @@ class VVencEncoder(Encoder):
             "-f", str(task.frames),
             "-q", str(task.qp),
             "-b", task.bitstream_out,
-            "-o", task.recon_out,
             "--preset", task.preset,
             "--alf", str(task.alf),
             "--sao", str(task.sao),
@@ -38,6 +37,8 @@ class VVencEncoder(Encoder):
             "--InternalBitDepth", "8",       # Ensure 8-bit internal processing
             "--OutputBitDepth", "8",         # Ensure 8-bit output
         ]
+        if task.recon_out:
+            cmd += ["-o", task.recon_out]
 
         log_path = Path(task.bitstream_out).with_suffix(".log")
         with open(log_path, "w") as log_file:
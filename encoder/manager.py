@@ -1,10 +1,17 @@
+import json
 import re
 from pathlib import Path
 from typing import List
-from dataclasses import dataclass
-from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from encoder.config import Config, EncodingTaskParams
 from encoder.encoders import Encoder
+from scheduler.memory import (
+    MB,
+    VVENC_MODEL,
+    MemoryBudgetScheduler,
+    MemoryEstimator,
+)
+from profiling.profiler import PROFILER
 
 
 @dataclass
@@ -56,7 +63,11 @@ class EncoderManager:
                     frames=self.cfg.frames_to_encode,
                     qp=qp,
                     bitstream_out=str(self.output_path / f"{stem}_QP{qp}.vvc"),
-                    recon_out=str(self.output_path / f"{stem}_QP{qp}_rec.yuv"),
+                    recon_out=(
+                        str(self.output_path / f"{stem}_QP{qp}_rec.yuv")
+                        if self.cfg.write_recon
+                        else None
+                    ),
                     preset=self.cfg.preset,
                     alf=self.cfg.alf,
                     sao=self.cfg.sao,
@@ -64,16 +75,43 @@ class EncoderManager:
                 tasks.append(task)
         return tasks
 
+    def _write_metadata(self, task: EncodingTaskParams):
+        """Stores stream properties next to the bitstream for later stages."""
+        metadata = asdict(Metadata(width=task.width, height=task.height, fps=task.fps))
+        metadata["frames"] = task.frames
+        if task.recon_out:
+            metadata["recon"] = task.recon_out
+        Path(task.bitstream_out).with_suffix(".json").write_text(json.dumps(metadata))
+
     def run(self):
         tasks = self._generate_tasks()
         print(
             f"Starting dataset generation: {len(tasks)} tasks using {self.cfg.max_workers} workers."
         )
 
-        with ProcessPoolExecutor(max_workers=self.cfg.max_workers) as executor:
-            results = list(executor.map(self.encoder.encode, tasks))
-
-        for r in results:
-            print(f"Success: {r}")
+        estimator = MemoryEstimator(
+            "vvenc", VVENC_MODEL, history_path=self.cfg.memory_history
+        )
+        estimates = [
+            estimator.estimate(t.width, t.height, t.frames, t.preset) for t in tasks
+        ]
+        budget = self.cfg.memory_budget_mb
+        scheduler = MemoryBudgetScheduler(
+            max_workers=self.cfg.max_workers,
+            budget_bytes=budget * MB if budget else None,
+        )
+        with PROFILER.stage("encode"):
+            outcomes = scheduler.run(self.encoder.encode, tasks, estimates)
+        PROFILER.count("encode.tasks", len(tasks))
+
+        results = []
+        for task, outcome in zip(tasks, outcomes):
+            estimator.observe(
+                task.width, task.height, task.frames, task.preset, outcome.peak_rss
+            )
+            self._write_metadata(task)
+            results.append(outcome.result)
+            print(f"Success: {outcome.result}")
+        estimator.save()
 
         return results
@@ -0,0 +1,55 @@
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from features_generator.generator import DEFAULT_CHANNELS
+
+
+@dataclass
+class Config:
+    """Base configuration for feature extraction."""
+
+    trace_input: List[str] = field(default_factory=list)
+    output_path: str = "./output/features"
+    metadata_dir: str = "./output/encoded"
+    width: Optional[int] = None
+    height: Optional[int] = None
+    frames: Optional[int] = None
+    channels: List[str] = field(default_factory=lambda: list(DEFAULT_CHANNELS))
+    dtype: str = "float32"
+    output_mode: str = "memmap"  # memmap or shared_memory
+    max_workers: Optional[int] = os.cpu_count()
+
+
+BASE_CONFIG = Config()
+
+
+@dataclass
+class FeatureTaskParams:
+    """Represents a single feature extraction job."""
+
+    trace_file: str
+    width: int
+    height: int
+    frames: Optional[int]
+    channels: Tuple[str, ...]
+    dtype: str
+    output_file: Optional[str] = None
+    shm_name: Optional[str] = None
+    profile: Optional[str] = None  # profiling mode, see StageProfiler.mode
+
+
+@dataclass
+class FeatureResult:
+    """
+    Small descriptor of a finished job, the tensor itself stays in
+    `output_file` or in the shared memory block `shm_name`.
+    """
+
+    trace_file: str
+    shape: Tuple[int, ...]
+    dtype: str
+    channels: Tuple[str, ...]
+    output_file: Optional[str] = None
+    shm_name: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
@@ -0,0 +1,148 @@
+import numpy as np
+from functools import partial
+from typing import Callable, Dict, Sequence, Tuple
+
+from features_generator.generator import DEFAULT_CHANNELS
+from profiling.profiler import PROFILER
+
+
+# Smallest luma block in VVC; MV fields are constant on this grid.
+MIN_BLOCK_SIZE = 4
+
+MV_LISTS: Tuple[str, ...] = ("MVL0", "MVL1")
+
+DERIVED_CHANNELS: Tuple[str, ...] = tuple(
+    f"{mv}_{suffix}"
+    for mv in MV_LISTS
+    for suffix in ("MAG", "ANG", "DIV", "VAR", "DT_X", "DT_Y")
+) + ("BIPRED",)
+
+
+class DerivedFeatureGenerator:
+    """
+    Computes motion features derived from the raw MV components of a
+    (frames, channels, H, W) tensor produced by `SequenceFeatureBuilder`.
+
+    All features are computed over the whole sequence at once on the
+    block grid (every `block_size`-th pixel) and, unless the block grid
+    result is requested, expanded back to full resolution at the end.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[str] = DEFAULT_CHANNELS,
+        block_size: int = MIN_BLOCK_SIZE,
+    ):
+        self.channels = tuple(channels)
+        self.block_size = block_size
+        self._features: Dict[str, Callable[[np.ndarray], np.ndarray]] = {}
+        for mv in MV_LISTS:
+            self._features[f"{mv}_MAG"] = partial(self._magnitude, mv)
+            self._features[f"{mv}_ANG"] = partial(self._angle, mv)
+            self._features[f"{mv}_DIV"] = partial(self._divergence, mv)
+            self._features[f"{mv}_VAR"] = partial(self._local_variance, mv)
+            self._features[f"{mv}_DT_X"] = partial(self._temporal_diff, f"{mv}_X")
+            self._features[f"{mv}_DT_Y"] = partial(self._temporal_diff, f"{mv}_Y")
+        self._features["BIPRED"] = self._bipred
+
+    def generate(
+        self,
+        tensor: np.ndarray,
+        names: Sequence[str] = DERIVED_CHANNELS,
+        full_resolution: bool = True,
+    ) -> np.ndarray:
+        """
+        Returns a float32 (frames, len(names), H, W) tensor with the
+        selected derived channels in the requested order. With
+        `full_resolution=False` the block grid tensor of shape
+        (frames, len(names), ceil(H / block_size), ceil(W / block_size))
+        is returned instead, `block_size**2` times smaller.
+        """
+        unknown = [n for n in names if n not in self._features]
+        if unknown:
+            raise ValueError(
+                f"Unknown derived channels {unknown}, expected any of {DERIVED_CHANNELS}"
+            )
+        if tensor.ndim != 4 or tensor.shape[1] != len(self.channels):
+            raise ValueError(
+                f"Expected (frames, {len(self.channels)}, H, W) tensor, got {tensor.shape}"
+            )
+
+        frames, _, height, width = tensor.shape
+        b = self.block_size
+        grid = tensor[:, :, ::b, ::b].astype(np.float32)
+
+        derived = np.empty(
+            (frames, len(names), grid.shape[2], grid.shape[3]), dtype=np.float32
+        )
+        for i, name in enumerate(names):
+            with PROFILER.stage(f"derived.{name}"):
+                derived[:, i] = self._features[name](grid)
+
+        if not full_resolution:
+            return derived
+
+        # a single copy: broadcast every grid cell to a b x b block
+        f, c, gh, gw = derived.shape
+        blocks = np.broadcast_to(
+            derived[:, :, :, None, :, None], (f, c, gh, b, gw, b)
+        )
+        full = blocks.reshape(f, c, gh * b, gw * b)
+        return full[:, :, :height, :width]
+
+    def _component(self, grid: np.ndarray, name: str) -> np.ndarray:
+        if name not in self.channels:
+            raise ValueError(f"Channel {name} required by derived features is missing")
+        return grid[:, self.channels.index(name)]
+
+    def _vector(self, grid: np.ndarray, mv: str) -> Tuple[np.ndarray, np.ndarray]:
+        return self._component(grid, f"{mv}_X"), self._component(grid, f"{mv}_Y")
+
+    def _magnitude(self, mv: str, grid: np.ndarray) -> np.ndarray:
+        return np.hypot(*self._vector(grid, mv))
+
+    def _angle(self, mv: str, grid: np.ndarray) -> np.ndarray:
+        """Angle in radians, in range [-pi, pi]."""
+        x, y = self._vector(grid, mv)
+        return np.arctan2(y, x)
+
+    def _divergence(self, mv: str, grid: np.ndarray) -> np.ndarray:
+        """d(mv_x)/dx + d(mv_y)/dy per pixel, using central differences on the block grid."""
+        x, y = self._vector(grid, mv)
+        div = np.zeros_like(x)
+        if x.shape[2] > 1:
+            div += np.gradient(x, axis=2)
+        if y.shape[1] > 1:
+            div += np.gradient(y, axis=1)
+        return div / self.block_size
+
+    def _local_variance(self, mv: str, grid: np.ndarray) -> np.ndarray:
+        """Sum of x and y variances over the 3x3 block neighbourhood."""
+        return sum(self._box_variance(c) for c in self._vector(grid, mv))
+
+    def _temporal_diff(self, name: str, grid: np.ndarray) -> np.ndarray:
+        """Difference to the previous POC, zero for the first frame."""
+        component = self._component(grid, name)
+        diff = np.zeros_like(component)
+        diff[1:] = component[1:] - component[:-1]
+        return diff
+
+    def _bipred(self, grid: np.ndarray) -> np.ndarray:
+        """1 where the block is predicted from both reference lists."""
+        used_l0 = self._component(grid, "MVL0_USED") != 0
+        used_l1 = self._component(grid, "MVL1_USED") != 0
+        return (used_l0 & used_l1).astype(np.float32)
+
+    @staticmethod
+    def _box_mean(values: np.ndarray) -> np.ndarray:
+        _, h, w = values.shape
+        padded = np.pad(values, ((0, 0), (1, 1), (1, 1)), mode="edge")
+        acc = np.zeros_like(values)
+        for dy in range(3):
+            for dx in range(3):
+                acc += padded[:, dy : dy + h, dx : dx + w]
+        return acc / 9.0
+
+    def _box_variance(self, values: np.ndarray) -> np.ndarray:
+        mean = self._box_mean(values)
+        return np.maximum(self._box_mean(values * values) - mean * mean, 0.0)
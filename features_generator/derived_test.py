@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+from features_generator.derived import DERIVED_CHANNELS, DerivedFeatureGenerator
+from features_generator.generator import DEFAULT_CHANNELS, SequenceFeatureBuilder
+from features_parser.tokens import MotionVector, VectorToken
+
+
+def mv_token(poc, x, y, w, h, param, mv_x, mv_y):
+    return VectorToken(
+        poc=poc, x=x, y=y, w=w, h=h, param=param, value=MotionVector(mv_x, mv_y)
+    )
+
+
+class TestDerivedFeatureGenerator(unittest.TestCase):
+    def setUp(self):
+        self.width = 16
+        self.height = 12
+        frames = {
+            0: [mv_token(0, 0, 0, 8, 8, "MVL0", 3.0, 4.0)],
+            1: [
+                mv_token(1, 0, 0, 8, 8, "MVL0", 0.0, 2.0),
+                mv_token(1, 0, 0, 4, 4, "MVL1", -1.0, 0.0),
+            ],
+        }
+        builder = SequenceFeatureBuilder(self.width, self.height)
+        self.tensor = builder.build(frames)
+        self.generator = DerivedFeatureGenerator(DEFAULT_CHANNELS)
+
+    def test_all_channels_shape(self):
+        derived = self.generator.generate(self.tensor)
+
+        self.assertEqual(
+            derived.shape, (2, len(DERIVED_CHANNELS), self.height, self.width)
+        )
+        self.assertEqual(derived.dtype, np.float32)
+
+    def test_block_grid_output(self):
+        full = self.generator.generate(self.tensor, ["MVL0_MAG", "BIPRED"])
+        grid = self.generator.generate(
+            self.tensor, ["MVL0_MAG", "BIPRED"], full_resolution=False
+        )
+
+        self.assertEqual(grid.shape, (2, 2, 3, 4))
+        np.testing.assert_array_equal(full[:, :, ::4, ::4], grid)
+        np.testing.assert_array_equal(full[:, :, 1::4, 3::4], grid)
+
+    def test_magnitude_and_angle(self):
+        derived = self.generator.generate(self.tensor, ["MVL0_MAG", "MVL1_ANG"])
+
+        self.assertEqual(derived.shape[1], 2)
+        self.assertAlmostEqual(derived[0, 0, 5, 5], 5.0)
+        self.assertEqual(derived[0, 0, 10, 10], 0.0)
+        self.assertAlmostEqual(derived[1, 1, 1, 1], np.pi)
+
+    def test_bipred_mask(self):
+        derived = self.generator.generate(self.tensor, ["BIPRED"])
+
+        self.assertFalse(derived[0].any())
+        self.assertEqual(derived[1, 0, 3, 3], 1.0)
+        self.assertEqual(derived[1, 0, 6, 6], 0.0)
+
+    def test_bipred_zero_vectors(self):
+        frames = {
+            0: [
+                mv_token(0, 0, 0, 8, 8, "MVL0", 0.0, 0.0),
+                mv_token(0, 0, 0, 8, 8, "MVL1", 0.0, 0.0),
+                mv_token(0, 8, 0, 8, 8, "MVL0", 0.0, 0.0),
+            ]
+        }
+        tensor = SequenceFeatureBuilder(self.width, self.height).build(frames)
+
+        derived = self.generator.generate(tensor, ["BIPRED"])
+
+        self.assertEqual(derived[0, 0, 4, 4], 1.0)
+        self.assertEqual(derived[0, 0, 4, 12], 0.0)
+
+    def test_temporal_difference(self):
+        derived = self.generator.generate(self.tensor, ["MVL0_DT_X", "MVL0_DT_Y"])
+
+        self.assertFalse(derived[0].any())
+        self.assertEqual(derived[1, 0, 2, 2], -3.0)
+        self.assertEqual(derived[1, 1, 2, 2], -2.0)
+
+    def test_variance_and_divergence(self):
+        derived = self.generator.generate(self.tensor, ["MVL0_VAR", "MVL0_DIV"])
+
+        # uniform motion inside the block, no spatial change
+        self.assertEqual(derived[0, 0, 0, 0], 0.0)
+        self.assertEqual(derived[0, 1, 0, 0], 0.0)
+        # block edge
+        self.assertGreater(derived[0, 0, 4, 4], 0.0)
+        self.assertNotEqual(derived[0, 1, 4, 4], 0.0)
+
+    def test_unknown_channel(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate(self.tensor, ["MVL2_MAG"])
+
+    def test_missing_source_channel(self):
+        generator = DerivedFeatureGenerator(("MVL0_X", "MVL0_Y"))
+        tensor = self.tensor[:, [3, 4]]
+
+        generator.generate(tensor, ["MVL0_MAG"])
+        with self.assertRaises(ValueError):
+            generator.generate(tensor, ["BIPRED"])
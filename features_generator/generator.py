@@ -1,6 +1,23 @@
 import numpy as np
-from typing import List, Dict
-from features_parser.parser import BlockStatToken
+from pathlib import Path
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+from features_parser.parser import BlockStatToken, VTMParser
+from profiling.profiler import PROFILER
+
+
+DEFAULT_CHANNELS: Tuple[str, ...] = (
+    "QP",
+    "PredMode",
+    "Depth",
+    "MVL0_X",
+    "MVL0_Y",
+    "MVL0_USED",
+    "MVL1_X",
+    "MVL1_Y",
+    "MVL1_USED",
+)
+
+SUPPORTED_DTYPES = (np.float32, np.float16, np.int16)
 
 
 class FeatureMapGenerator:
@@ -16,6 +33,156 @@ class FeatureMapGenerator:
         """
         maps = {}
 
-        for token in tokens:
-            token.paint(maps, self.width, self.height)
+        with PROFILER.stage("paint"):
+            for token in tokens:
+                token.paint(maps, self.width, self.height)
+        PROFILER.count("paint.blocks", len(tokens))
         return maps
+
+
+class SequenceFeatureBuilder(FeatureMapGenerator):
+    """
+    Builds a single (frames, channels, H, W) tensor for a whole sequence.
+
+    The channel layout is fixed by `channels`, so every frame has the same
+    schema regardless of which tokens appeared in it. Channels without any
+    tokens in a frame stay zero, tokens painting only undeclared channels
+    are skipped. Channel names must be produced by the `VTMParser`
+    handlers, or be listed in `known_channels` for custom handlers.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        channels: Sequence[str] = DEFAULT_CHANNELS,
+        dtype=np.float32,
+        known_channels: Optional[Sequence[str]] = None,
+    ):
+        super().__init__(width, height)
+        if len(set(channels)) != len(channels):
+            raise ValueError(f"Duplicate channel names in schema: {channels}")
+        if known_channels is None:
+            known_channels = VTMParser().channels()
+        unknown = [c for c in channels if c not in known_channels]
+        if unknown:
+            raise ValueError(
+                f"Unknown channels {unknown}, expected any of {tuple(known_channels)}"
+            )
+        if np.dtype(dtype) not in [np.dtype(d) for d in SUPPORTED_DTYPES]:
+            raise ValueError(
+                f"Unsupported dtype {np.dtype(dtype)}, "
+                f"expected one of {[np.dtype(d).name for d in SUPPORTED_DTYPES]}"
+            )
+        self.channels: Tuple[str, ...] = tuple(channels)
+        self.dtype = np.dtype(dtype)
+        self._index = {name: i for i, name in enumerate(self.channels)}
+        self._scratch: Optional[np.ndarray] = None
+
+    def channel_index(self, name: str) -> int:
+        return self._index[name]
+
+    def allocate(
+        self, num_frames: int, out_path: Optional[Union[str, Path]] = None
+    ) -> np.ndarray:
+        """
+        Allocates a zeroed tensor, either in memory or as a .npy memory map
+        at `out_path`.
+        """
+        shape = (num_frames, len(self.channels), self.height, self.width)
+        if out_path is None:
+            return np.zeros(shape, dtype=self.dtype)
+        # open_memmap creates a sparse file, so the tensor starts out zeroed
+        return np.lib.format.open_memmap(
+            str(out_path), mode="w+", dtype=self.dtype, shape=shape
+        )
+
+    def fill_frame(
+        self, tensor: np.ndarray, frame_idx: int, tokens: List["BlockStatToken"]
+    ):
+        """
+        Paints tokens of one frame directly into `tensor[frame_idx]`.
+        """
+        frame = tensor[frame_idx]
+        targets: Dict[str, Optional[Dict[str, np.ndarray]]] = {}
+        width, height = self.width, self.height
+
+        with PROFILER.stage("paint"):
+            for token in tokens:
+                try:
+                    maps = targets[token.param]
+                except KeyError:
+                    maps = targets[token.param] = self._target_maps(frame, token)
+                if maps is not None:
+                    token.paint(maps, width, height)
+
+        if PROFILER.enabled:
+            PROFILER.count(
+                "paint.blocks", sum(1 for t in tokens if targets[t.param] is not None)
+            )
+
+    def _target_maps(
+        self, frame: np.ndarray, token: "BlockStatToken"
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Maps of `frame` the token paints into, None if it paints only
+        undeclared channels. Computed once per param and frame.
+        """
+        names = token.channels()
+        if not any(n in self._index for n in names):
+            return None
+        # vector tokens always paint all their maps, route the undeclared
+        # ones to a throwaway plane
+        return {
+            n: frame[self._index[n]] if n in self._index else self._scratch_plane()
+            for n in names
+        }
+
+    def build(
+        self,
+        frames: Dict[int, List["BlockStatToken"]],
+        num_frames: Optional[int] = None,
+        out_path: Optional[Union[str, Path]] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Creates the feature tensor for all POCs, e.g. the output of
+        `VTMParser.parse_file`. Frame index equals POC.
+        A zeroed, preallocated `out` array (e.g. backed by shared memory)
+        is filled in place instead of allocating a new tensor.
+        """
+        if num_frames is None:
+            if out is not None:
+                num_frames = out.shape[0]
+            else:
+                num_frames = max(frames) + 1 if frames else 0
+
+        out_of_range = [poc for poc in frames if not 0 <= poc < num_frames]
+        if out_of_range:
+            raise ValueError(
+                f"POCs {sorted(out_of_range)} out of range for {num_frames} frames"
+            )
+
+        if out is not None:
+            expected = (num_frames, len(self.channels), self.height, self.width)
+            if out.shape != expected or out.dtype != self.dtype:
+                raise ValueError(
+                    f"Output array {out.shape} {out.dtype} does not match "
+                    f"{expected} {self.dtype}"
+                )
+
+        with PROFILER.stage("build"):
+            tensor = out if out is not None else self.allocate(num_frames, out_path)
+            for poc, tokens in frames.items():
+                self.fill_frame(tensor, poc, tokens)
+
+            if isinstance(tensor, np.memmap):
+                tensor.flush()
+        PROFILER.count("build.frames", num_frames)
+        PROFILER.count("build.bytes_written", tensor.nbytes)
+        return tensor
+
+    def _scratch_plane(self) -> np.ndarray:
+        if self._scratch is None:
+            self._scratch = np.zeros((self.height, self.width), dtype=self.dtype)
+        return self._scratch
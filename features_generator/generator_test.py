@@ -1,5 +1,14 @@
+import tempfile
 import unittest
-from features_generator.generator import FeatureMapGenerator
+from pathlib import Path
+
+import numpy as np
+
+from features_generator.generator import (
+    DEFAULT_CHANNELS,
+    FeatureMapGenerator,
+    SequenceFeatureBuilder,
+)
 from features_parser.tokens import MotionVector, ScalarToken, VectorToken
 
 
@@ -41,3 +50,93 @@ class TestFeatureMapGenerator(unittest.TestCase):
 
         self.assertEqual(maps["MVL0_X"][2, 2], -2.5)
         self.assertEqual(maps["MVL0_Y"][2, 2], 1.0)
+        self.assertEqual(maps["MVL0_USED"][2, 2], 1.0)
+        self.assertEqual(maps["MVL0_USED"][8, 8], 0.0)
+
+
+class TestSequenceFeatureBuilder(unittest.TestCase):
+    def setUp(self):
+        self.width = 16
+        self.height = 16
+        self.frames = {
+            0: [ScalarToken(poc=0, x=0, y=0, w=8, h=8, param="QP", value=22.0)],
+            2: [
+                ScalarToken(poc=2, x=8, y=8, w=8, h=8, param="QP", value=27.0),
+                VectorToken(
+                    poc=2,
+                    x=0,
+                    y=0,
+                    w=4,
+                    h=4,
+                    param="MVL1",
+                    value=MotionVector(x=-3.0, y=5.0),
+                ),
+            ],
+        }
+
+    def test_build_fixed_schema(self):
+        builder = SequenceFeatureBuilder(self.width, self.height)
+
+        tensor = builder.build(self.frames)
+
+        self.assertEqual(tensor.shape, (3, len(DEFAULT_CHANNELS), 16, 16))
+        self.assertEqual(tensor.dtype, np.float32)
+        qp = builder.channel_index("QP")
+        mvl1_x = builder.channel_index("MVL1_X")
+        mvl1_y = builder.channel_index("MVL1_Y")
+        self.assertEqual(tensor[0, qp, 4, 4], 22.0)
+        self.assertEqual(tensor[2, qp, 12, 12], 27.0)
+        self.assertEqual(tensor[2, mvl1_x, 2, 2], -3.0)
+        self.assertEqual(tensor[2, mvl1_y, 2, 2], 5.0)
+        self.assertFalse(tensor[0, mvl1_x].any())
+        self.assertFalse(tensor[1].any())
+
+    def test_partial_vector_schema(self):
+        builder = SequenceFeatureBuilder(
+            self.width, self.height, channels=("MVL1_Y",), dtype=np.int16
+        )
+
+        tensor = builder.build(self.frames)
+
+        self.assertEqual(tensor.shape, (3, 1, 16, 16))
+        self.assertEqual(tensor.dtype, np.int16)
+        self.assertEqual(tensor[2, 0, 2, 2], 5)
+        self.assertEqual(tensor[2, 0, 12, 12], 0)
+
+    def test_build_memmap(self):
+        builder = SequenceFeatureBuilder(self.width, self.height, dtype=np.float16)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out_path = Path(tmp) / "features.npy"
+            tensor = builder.build(self.frames, num_frames=4, out_path=out_path)
+            del tensor
+
+            loaded = np.load(out_path)
+            self.assertEqual(loaded.shape, (4, len(DEFAULT_CHANNELS), 16, 16))
+            self.assertEqual(loaded.dtype, np.float16)
+            self.assertEqual(loaded[2, builder.channel_index("QP"), 12, 12], 27.0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SequenceFeatureBuilder(self.width, self.height, dtype=np.float64)
+        with self.assertRaises(ValueError):
+            SequenceFeatureBuilder(self.width, self.height, channels=("QP", "QP"))
+        with self.assertRaises(ValueError):
+            SequenceFeatureBuilder(self.width, self.height, channels=("qp",))
+
+        builder = SequenceFeatureBuilder(self.width, self.height)
+        with self.assertRaises(ValueError):
+            builder.build(self.frames, num_frames=2)
+
+    def test_known_channels_extension(self):
+        builder = SequenceFeatureBuilder(
+            self.width,
+            self.height,
+            channels=("QP", "SAO"),
+            known_channels=DEFAULT_CHANNELS + ("SAO",),
+        )
+
+        tensor = builder.build(self.frames)
+
+        self.assertEqual(tensor.shape[1], 2)
+        self.assertFalse(tensor[:, 1].any())
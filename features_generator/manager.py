@@ -0,0 +1,167 @@
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from features_generator.config import Config, FeatureResult, FeatureTaskParams
+from features_generator.generator import SequenceFeatureBuilder
+from features_parser.parser import VTMParser
+from profiling.profiler import PROFILER
+
+
+OUTPUT_MODES = ("memmap", "shared_memory")
+
+
+def extract_features(task: FeatureTaskParams) -> FeatureResult:
+    """
+    Parses a trace and rasterizes it straight into the task output, either a
+    .npy memory map or an existing shared memory block. Only the descriptor
+    is sent back to the parent process, together with the worker's
+    profiling snapshot when profiling is enabled.
+    """
+    # a forked worker inherits the parent's profiler state, including an
+    # active cProfile hook of the enclosing stage nobody would collect
+    sys.setprofile(None)
+    PROFILER.configure(
+        enabled=task.profile is not None, use_cprofile=task.profile == "cprofile"
+    )
+
+    builder = SequenceFeatureBuilder(
+        task.width, task.height, channels=task.channels, dtype=np.dtype(task.dtype)
+    )
+    grouped = VTMParser().parse_file(task.trace_file)
+
+    if task.shm_name is None:
+        tensor = builder.build(grouped, num_frames=task.frames, out_path=task.output_file)
+        shape = tensor.shape
+        del tensor
+    else:
+        shm = shared_memory.SharedMemory(name=task.shm_name)
+        try:
+            shape = (task.frames, len(task.channels), task.height, task.width)
+            out = np.ndarray(shape, dtype=np.dtype(task.dtype), buffer=shm.buf)
+            builder.build(grouped, num_frames=task.frames, out=out)
+            del out
+        finally:
+            shm.close()
+
+    return FeatureResult(
+        trace_file=task.trace_file,
+        shape=tuple(shape),
+        dtype=task.dtype,
+        channels=tuple(task.channels),
+        output_file=task.output_file,
+        shm_name=task.shm_name,
+        profile=PROFILER.snapshot() if task.profile is not None else None,
+    )
+
+
+@dataclass
+class FeatureManager:
+    cfg: Config
+    shared_blocks: Dict[str, shared_memory.SharedMemory] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.cfg.output_mode not in OUTPUT_MODES:
+            raise ValueError(
+                f"Unknown output mode {self.cfg.output_mode}, expected one of {OUTPUT_MODES}"
+            )
+        self.output_path = Path(self.cfg.output_path).resolve()
+        self.output_path.mkdir(parents=True, exist_ok=True)
+
+    def _read_metadata(self, trace: Path) -> dict:
+        """Reads the stream properties written by `EncoderManager`, if any."""
+        metadata_path = Path(self.cfg.metadata_dir) / f"{trace.stem}.json"
+        if not metadata_path.is_file():
+            return {}
+        return json.loads(metadata_path.read_text())
+
+    def _generate_tasks(self) -> List[FeatureTaskParams]:
+        tasks = []
+        for t in self.cfg.trace_input:
+            t_path = Path(t)
+            metadata = self._read_metadata(t_path)
+            width = self.cfg.width or metadata.get("width")
+            height = self.cfg.height or metadata.get("height")
+            if not width or not height:
+                raise ValueError(f"Unknown resolution of {t}, set width and height")
+
+            tasks.append(
+                FeatureTaskParams(
+                    trace_file=str(t_path),
+                    width=width,
+                    height=height,
+                    frames=self.cfg.frames or metadata.get("frames"),
+                    channels=tuple(self.cfg.channels),
+                    dtype=self.cfg.dtype,
+                    output_file=str(self.output_path / f"{t_path.stem}_features.npy"),
+                    profile=PROFILER.mode,
+                )
+            )
+        return tasks
+
+    def _allocate_shared(self, task: FeatureTaskParams):
+        if task.frames is None:
+            raise ValueError(
+                f"Frame count of {task.trace_file} is required for shared memory output"
+            )
+        shape = (task.frames, len(task.channels), task.height, task.width)
+        size = int(np.prod(shape)) * np.dtype(task.dtype).itemsize
+        # fresh shared memory is zero filled, as the builder expects
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.shared_blocks[shm.name] = shm
+        task.shm_name = shm.name
+        task.output_file = None
+
+    def array(self, result: FeatureResult) -> np.ndarray:
+        """Returns a zero-copy view of a result tensor."""
+        if result.shm_name is not None:
+            shm = self.shared_blocks[result.shm_name]
+            return np.ndarray(result.shape, dtype=np.dtype(result.dtype), buffer=shm.buf)
+        return np.load(result.output_file, mmap_mode="r")
+
+    def release(self):
+        """Frees shared memory blocks, views returned by `array` become invalid."""
+        for shm in self.shared_blocks.values():
+            shm.close()
+            shm.unlink()
+        self.shared_blocks.clear()
+
+    def __enter__(self) -> "FeatureManager":
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def run(self) -> List[FeatureResult]:
+        tasks = self._generate_tasks()
+        try:
+            if self.cfg.output_mode == "shared_memory":
+                for task in tasks:
+                    self._allocate_shared(task)
+
+            print(
+                f"Starting feature extraction: {len(tasks)} tasks "
+                f"using {self.cfg.max_workers} workers."
+            )
+
+            with PROFILER.stage("features"):
+                with ProcessPoolExecutor(max_workers=self.cfg.max_workers) as executor:
+                    results = list(executor.map(extract_features, tasks))
+        except BaseException:
+            # nobody gets a handle to the blocks of a failed run
+            self.release()
+            raise
+        PROFILER.count("features.tasks", len(tasks))
+
+        for r in results:
+            if r.profile is not None:
+                PROFILER.merge(r.profile)
+            print(f"Success: {r.output_file or r.shm_name} {r.shape}")
+
+        return results
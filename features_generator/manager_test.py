@@ -0,0 +1,142 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from features_generator.config import Config
+from features_generator.manager import FeatureManager
+from profiling.profiler import PROFILER
+
+
+TRACES = {
+    "a_QP27": (
+        "BlockStat: POC 0 @(   0,   0) [ 8x 8] QP=22\n"
+        "BlockStat: POC 1 @(   8,   8) [ 8x 8] MVL0={-4, 12}\n"
+    ),
+    "b_QP27": "BlockStat: POC 2 @(   0,   0) [ 16x 16] QP=32\n",
+}
+
+
+class TestFeatureManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.metadata_dir = root / "encoded"
+        self.metadata_dir.mkdir()
+        self.traces = []
+        for stem, content in TRACES.items():
+            trace = root / f"{stem}.csv"
+            trace.write_text(content)
+            self.traces.append(str(trace))
+            metadata = {"width": 16, "height": 16, "fps": 30, "frames": 4}
+            (self.metadata_dir / f"{stem}.json").write_text(json.dumps(metadata))
+        self.output_path = root / "features"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def config(self, **kwargs) -> Config:
+        return Config(
+            trace_input=self.traces,
+            output_path=str(self.output_path),
+            metadata_dir=str(self.metadata_dir),
+            channels=["QP", "MVL0_X", "MVL0_Y"],
+            max_workers=2,
+            **kwargs,
+        )
+
+    def test_memmap_output(self):
+        manager = FeatureManager(self.config(dtype="int16"))
+
+        results = manager.run()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].shape, (4, 3, 16, 16))
+        self.assertTrue(Path(results[0].output_file).is_file())
+        a = manager.array(results[0])
+        b = manager.array(results[1])
+        self.assertEqual(a.dtype, np.int16)
+        self.assertEqual(a[0, 0, 0, 0], 22)
+        self.assertEqual(a[1, 2, 12, 12], 12)
+        self.assertEqual(b[2, 0, 15, 15], 32)
+
+    def test_shared_memory_output(self):
+        manager = FeatureManager(self.config(output_mode="shared_memory"))
+
+        try:
+            results = manager.run()
+
+            self.assertIsNone(results[0].output_file)
+            self.assertIsNotNone(results[0].shm_name)
+            a = manager.array(results[0])
+            self.assertEqual(a.shape, (4, 3, 16, 16))
+            self.assertEqual(a[1, 1, 12, 12], -4.0)
+            self.assertEqual(manager.array(results[1])[2, 0, 0, 0], 32.0)
+            del a
+        finally:
+            manager.release()
+        self.assertEqual(manager.shared_blocks, {})
+
+    def test_shared_memory_released_on_failure(self):
+        bad = Path(self.tmp.name) / "bad_QP27.csv"
+        bad.write_text("BlockStat: POC 9 @(   0,   0) [ 8x 8] QP=22\n")
+        cfg = self.config(output_mode="shared_memory")
+        cfg.trace_input = self.traces + [str(bad)]
+        cfg.frames = 4
+        manager = FeatureManager(cfg)
+
+        with self.assertRaises(ValueError):
+            manager.run()
+        self.assertEqual(manager.shared_blocks, {})
+
+    def test_context_manager_releases_shared_memory(self):
+        with FeatureManager(self.config(output_mode="shared_memory")) as manager:
+            manager.run()
+            self.assertEqual(len(manager.shared_blocks), 2)
+        self.assertEqual(manager.shared_blocks, {})
+
+    def test_worker_profiles_are_merged(self):
+        PROFILER.configure()
+        try:
+            FeatureManager(self.config()).run()
+            report = PROFILER.report()
+        finally:
+            PROFILER.configure(enabled=False)
+
+        self.assertEqual(report["stages"]["parse"]["calls"], 2)
+        self.assertEqual(report["stages"]["build"]["calls"], 2)
+        self.assertIn("group_on_poc", report["stages"])
+        self.assertEqual(report["stages"]["features"]["calls"], 1)
+        self.assertEqual(report["counters"]["parse.lines"], 3)
+        self.assertEqual(report["counters"]["parse.tokens.QP"], 2)
+        self.assertEqual(report["counters"]["paint.blocks"], 3)
+        self.assertEqual(report["counters"]["features.tasks"], 2)
+        self.assertIn("parse.bytes_read", report["counters"])
+
+    def test_worker_cprofile_is_merged(self):
+        PROFILER.configure(use_cprofile=True)
+        try:
+            FeatureManager(self.config()).run()
+            report = PROFILER.report()
+        finally:
+            PROFILER.configure(enabled=False)
+
+        self.assertIn("features", report["cprofile"])
+        for stage in ("parse", "build"):
+            functions = [row["function"] for row in report["cprofile"][stage]]
+            self.assertTrue(functions, stage)
+        parse_functions = " ".join(r["function"] for r in report["cprofile"]["parse"])
+        self.assertIn("parser.py", parse_functions)
+
+    def test_missing_resolution(self):
+        cfg = self.config()
+        cfg.metadata_dir = str(self.output_path)
+
+        with self.assertRaises(ValueError):
+            FeatureManager(cfg).run()
+
+    def test_invalid_output_mode(self):
+        with self.assertRaises(ValueError):
+            FeatureManager(self.config(output_mode="pickle"))
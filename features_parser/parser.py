@@ -1,5 +1,7 @@
 from abc import abstractmethod, ABC
-from typing import DefaultDict, List, Optional
+from collections import Counter
+from typing import DefaultDict, List, Optional, Tuple
+import os
 import re
 
 from features_parser.tokens import (
@@ -8,6 +10,7 @@ from features_parser.tokens import (
     ScalarToken,
     VectorToken,
 )
+from profiling.profiler import PROFILER
 
 
 VTM_DECODER_BLOCK_REGEX = (
@@ -33,6 +36,10 @@ class BaseHandler(ABC):
     def process_value(self, raw_val: str):
         pass
 
+    def channels(self) -> Tuple[str, ...]:
+        """Names of the feature maps painted by tokens of this handler."""
+        return (self.param_name,)
+
     def tokenize(self, poc, x, y, w, h, value) -> BlockStatToken:
         return BlockStatToken(poc, x, y, w, h, self.param_name, value)
 
@@ -43,6 +50,9 @@ class ScalarHandler(BaseHandler):
     def process_value(self, raw_val: str):
         return float(raw_val)
 
+    def channels(self) -> Tuple[str, ...]:
+        return ScalarToken.channel_names(self.param_name)
+
     def tokenize(self, poc, x, y, w, h, value) -> ScalarToken:
         return ScalarToken(poc, x, y, w, h, self.param_name, value)
 
@@ -56,6 +66,9 @@ class VectorHandler(BaseHandler):
             return MotionVector(float(nums[0]), float(nums[1]))
         return MotionVector()
 
+    def channels(self) -> Tuple[str, ...]:
+        return VectorToken.channel_names(self.param_name)
+
     def tokenize(self, poc, x, y, w, h, value) -> VectorToken:
         return VectorToken(poc, x, y, w, h, self.param_name, value)
 
@@ -71,29 +84,45 @@ class VTMParser:
         ]
         self.tokens: List[BlockStatToken] = []
 
+    def channels(self) -> Tuple[str, ...]:
+        """All feature map names the handlers of this parser can produce."""
+        return tuple(name for h in self.handlers for name in h.channels())
+
     def group_on_poc(self):
         if not self.tokens:
             return {}
 
-        self.tokens.sort(key=lambda t: (t.poc, t.y, t.x))
-        grouped = DefaultDict(list)
-        for token in self.tokens:
-            grouped[token.poc].append(token)
+        with PROFILER.stage("group_on_poc"):
+            self.tokens.sort(key=lambda t: (t.poc, t.y, t.x))
+            grouped = DefaultDict(list)
+            for token in self.tokens:
+                grouped[token.poc].append(token)
 
         return dict(grouped)
 
     def parse(self, line_iterator):
-        for line in line_iterator:
-            if not line.startswith("BlockStat:"):
-                continue
-            for handler in self.handlers:
-                token = handler.parse(line)
-                if token:
-                    self.tokens.append(token)
-                    break
+        start = len(self.tokens)
+        lines = 0
+        with PROFILER.stage("parse"):
+            for line in line_iterator:
+                lines += 1
+                if not line.startswith("BlockStat:"):
+                    continue
+                for handler in self.handlers:
+                    token = handler.parse(line)
+                    if token:
+                        self.tokens.append(token)
+                        break
+
+        if PROFILER.enabled:
+            PROFILER.count("parse.lines", lines)
+            new_tokens = Counter(t.param for t in self.tokens[start:])
+            for param, n in new_tokens.items():
+                PROFILER.count(f"parse.tokens.{param}", n)
         return self.tokens
 
     def parse_file(self, file_path: str):
         with open(file_path, "r") as f:
             self.parse(f)
+        PROFILER.count("parse.bytes_read", os.path.getsize(file_path))
         return self.group_on_poc()
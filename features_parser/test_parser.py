@@ -73,3 +73,11 @@ class TestVTMParser(unittest.TestCase):
         self.assertEqual(token.poc, 31)
         self.assertEqual(token.x, 8)
         self.assertEqual(token.w, 8)
+
+    def test_channels(self):
+        channels = self.parser.channels()
+
+        self.assertIn("QP", channels)
+        self.assertIn("MVL0_X", channels)
+        self.assertIn("MVL1_Y", channels)
+        self.assertNotIn("MVL0", channels)
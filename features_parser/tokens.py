@@ -1,7 +1,7 @@
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Any, NamedTuple
-import numpy as np
+from functools import lru_cache
+from typing import Any, NamedTuple, Tuple
 
 
 @dataclass()
@@ -14,6 +14,11 @@ class BlockStatToken:
     param: str
     value: Any
 
+    @abstractmethod
+    def channels(self) -> Tuple[str, ...]:
+        """Names of the feature maps this token paints into."""
+        pass
+
     @abstractmethod
     def paint(self, maps: dict, width: int, height: int):
         pass
@@ -25,6 +30,13 @@ class ScalarToken(BlockStatToken):
 
     value: float
 
+    @staticmethod
+    def channel_names(param: str) -> Tuple[str, ...]:
+        return (param,)
+
+    def channels(self) -> Tuple[str, ...]:
+        return self.channel_names(self.param)
+
     def paint(self, maps: dict, width: int, height: int):
         """
         Paints scalar value to the map, e.g.
@@ -35,6 +47,9 @@ class ScalarToken(BlockStatToken):
          [0, 0, 0, 0]]
         """
         if self.param not in maps:
+            # lazy, so that parsing traces alone does not pay for numpy
+            import numpy as np
+
             maps[self.param] = np.zeros((height, width), dtype=np.float32)
 
         maps[self.param][
@@ -53,6 +68,14 @@ class VectorToken(BlockStatToken):
 
     value: MotionVector
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def channel_names(param: str) -> Tuple[str, ...]:
+        return (f"{param}_X", f"{param}_Y", f"{param}_USED")
+
+    def channels(self) -> Tuple[str, ...]:
+        return self.channel_names(self.param)
+
     def paint(self, maps: dict, width: int, height: int):
         """
         Paints motion vector to the map, e.g.
@@ -61,13 +84,20 @@ class VectorToken(BlockStatToken):
          [0, 9, 9, 0],
          [0, 9, 9, 0],
          [0, 0, 0, 0]]
-        This happens two times for x and y vectors
+        This happens two times for x and y vectors. The block is also
+        marked with 1 in the `_USED` map, so zero vectors stay
+        distinguishable from blocks not predicted from this list.
         """
-        name_x, name_y = f"{self.param}_X", f"{self.param}_Y"
+        name_x, name_y, name_used = self.channels()
 
         if name_x not in maps:
+            import numpy as np
+
             maps[name_x] = np.zeros((height, width), dtype=np.float32)
             maps[name_y] = np.zeros((height, width), dtype=np.float32)
+            maps[name_used] = np.zeros((height, width), dtype=np.float32)
 
-        maps[name_x][self.y : self.y + self.h, self.x : self.x + self.w] = self.value.x
-        maps[name_y][self.y : self.y + self.h, self.x : self.x + self.w] = self.value.y
+        block = (slice(self.y, self.y + self.h), slice(self.x, self.x + self.w))
+        maps[name_x][block] = self.value.x
+        maps[name_y][block] = self.value.y
+        maps[name_used][block] = 1
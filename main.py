@@ -1,23 +1,8 @@
-import yaml
-from decoder.decoders import VTMDecoder
-from decoder.manager import DecoderManager
-from encoder.config import BASE_CONFIG as ENC_BASE_CONFIG
-from decoder.config import BASE_CONFIG as DEC_BASE_CONFIG
-from encoder.encoders import VVencEncoder
-from encoder.manager import EncoderManager
+import sys
 
+from cli.main import main
 
-if __name__ == "__main__":
-    with open("config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-
-    vvenc = VVencEncoder()
-    enc_mgr = EncoderManager(ENC_BASE_CONFIG, vvenc)
 
-    bitstream_path = enc_mgr.run()
-
-    dec_config = DEC_BASE_CONFIG
-    dec_config.bitstream_input = bitstream_path
-    vtm_dec = VTMDecoder()
-    dec_mgr = DecoderManager(dec_config, decoder=vtm_dec)
-    dec_mgr.run()
+if __name__ == "__main__":
+    # keep the historical behaviour of `python main.py`: encode, then decode
+    sys.exit(main(sys.argv[1:] or ["run"]))
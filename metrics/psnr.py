@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+
+MAX_PIXEL_VALUE = 255.0
+
+
+def frame_size(width: int, height: int) -> int:
+    """Size in bytes of a single 8-bit YUV420 frame."""
+    return width * height * 3 // 2
+
+
+def iter_luma(path: str, width: int, height: int) -> Iterator[np.ndarray]:
+    """Yields the Y plane of each frame, reading one frame at a time."""
+    size = frame_size(width, height)
+    luma_size = width * height
+    with open(path, "rb") as f:
+        while True:
+            frame = f.read(size)
+            if len(frame) < size:
+                break
+            yield np.frombuffer(frame, dtype=np.uint8, count=luma_size).reshape(
+                height, width
+            )
+
+
+def psnr(reference: np.ndarray, distorted: np.ndarray) -> float:
+    mse = np.mean((reference.astype(np.float64) - distorted.astype(np.float64)) ** 2)
+    if mse == 0:
+        return float("inf")
+    return float(10 * np.log10(MAX_PIXEL_VALUE**2 / mse))
+
+
+def luma_psnr_per_frame(
+    reference: str, distorted: str, width: int, height: int
+) -> List[Tuple[int, float]]:
+    """
+    Computes Y-PSNR for every frame present in both files.
+    """
+    for path in (reference, distorted):
+        if not Path(path).is_file():
+            raise FileNotFoundError(path)
+
+    return [
+        (i, psnr(ref, dist))
+        for i, (ref, dist) in enumerate(
+            zip(iter_luma(reference, width, height), iter_luma(distorted, width, height))
+        )
+    ]
@@ -0,0 +1,88 @@
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List
+
+from metrics.psnr import frame_size
+
+
+# Frames read per chunk, bounds memory to a few frames per file.
+CHUNK_FRAMES = 8
+
+
+@dataclass
+class ReconComparison:
+    reference: str
+    candidate: str
+    frames_reference: int
+    frames_candidate: int
+    mismatched_frames: List[int] = field(default_factory=list)
+
+    @property
+    def identical(self) -> bool:
+        return (
+            not self.mismatched_frames
+            and self.frames_reference == self.frames_candidate
+        )
+
+
+def frame_digests(
+    path: str, width: int, height: int, chunk_frames: int = CHUNK_FRAMES
+) -> Iterator[bytes]:
+    """
+    Yields a digest per 8-bit YUV420 frame, reading `chunk_frames` frames
+    at a time. A trailing partial frame gets a digest too, so truncated
+    files never compare equal.
+    """
+    size = frame_size(width, height)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(size * chunk_frames)
+            if not chunk:
+                break
+            view = memoryview(chunk)
+            for offset in range(0, len(chunk), size):
+                frame = view[offset : offset + size]
+                yield hashlib.blake2b(frame, digest_size=16).digest()
+
+
+def compare_reconstructions(
+    reference: str, candidate: str, width: int, height: int
+) -> ReconComparison:
+    """
+    Compares two reconstructions frame by frame without loading them into
+    memory. Frames present in only one file count as mismatched.
+    """
+    for path in (reference, candidate):
+        if not Path(path).is_file():
+            raise FileNotFoundError(path)
+
+    ref_digests = list(frame_digests(reference, width, height))
+    mismatched = []
+    frames_candidate = 0
+    for i, digest in enumerate(frame_digests(candidate, width, height)):
+        frames_candidate += 1
+        if i >= len(ref_digests) or ref_digests[i] != digest:
+            mismatched.append(i)
+    mismatched.extend(range(frames_candidate, len(ref_digests)))
+
+    return ReconComparison(
+        reference=reference,
+        candidate=candidate,
+        frames_reference=len(ref_digests),
+        frames_candidate=frames_candidate,
+        mismatched_frames=mismatched,
+    )
+
+
+def deduplicate_reconstruction(
+    keep: str, duplicate: str, width: int, height: int
+) -> ReconComparison:
+    """
+    Verifies `duplicate` against `keep` and removes it when both match.
+    Mismatching files are both kept for inspection.
+    """
+    comparison = compare_reconstructions(keep, duplicate, width, height)
+    if comparison.identical:
+        Path(duplicate).unlink()
+    return comparison
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from metrics.recon import compare_reconstructions, deduplicate_reconstruction
+
+
+WIDTH = 8
+HEIGHT = 8
+FRAME = WIDTH * HEIGHT * 3 // 2
+
+
+def write_frames(path: Path, values):
+    np.concatenate([np.full(FRAME, v, dtype=np.uint8) for v in values]).tofile(path)
+
+
+class TestReconVerification(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.ref = self.dir / "vtm_rec.yuv"
+        self.enc = self.dir / "enc_rec.yuv"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_identical(self):
+        values = list(range(20))
+        write_frames(self.ref, values)
+        write_frames(self.enc, values)
+
+        result = compare_reconstructions(str(self.ref), str(self.enc), WIDTH, HEIGHT)
+
+        self.assertTrue(result.identical)
+        self.assertEqual(result.frames_reference, 20)
+        self.assertEqual(result.mismatched_frames, [])
+
+    def test_mismatch_reported_per_frame(self):
+        write_frames(self.ref, [1, 2, 3, 4, 5])
+        write_frames(self.enc, [1, 9, 3, 4])
+
+        result = compare_reconstructions(str(self.ref), str(self.enc), WIDTH, HEIGHT)
+
+        self.assertFalse(result.identical)
+        self.assertEqual(result.frames_candidate, 4)
+        self.assertEqual(result.mismatched_frames, [1, 4])
+
+    def test_truncated_frame_mismatch(self):
+        write_frames(self.ref, [1, 2])
+        self.enc.write_bytes(self.ref.read_bytes()[:-1])
+
+        result = compare_reconstructions(str(self.ref), str(self.enc), WIDTH, HEIGHT)
+
+        self.assertEqual(result.mismatched_frames, [1])
+
+    def test_deduplicate(self):
+        write_frames(self.ref, [7, 7])
+        write_frames(self.enc, [7, 7])
+
+        deduplicate_reconstruction(str(self.ref), str(self.enc), WIDTH, HEIGHT)
+
+        self.assertTrue(self.ref.is_file())
+        self.assertFalse(self.enc.exists())
+
+    def test_deduplicate_keeps_mismatch(self):
+        write_frames(self.ref, [7, 7])
+        write_frames(self.enc, [7, 8])
+
+        result = deduplicate_reconstruction(str(self.ref), str(self.enc), WIDTH, HEIGHT)
+
+        self.assertEqual(result.mismatched_frames, [1])
+        self.assertTrue(self.enc.is_file())
@@ -0,0 +1,226 @@
+"""
+Opt-in stage profiling.
+
+Enabled with the VVC_PROFILE environment variable ("1" for timers and
+counters, "cprofile" to additionally run cProfile per stage) or with
+`PROFILER.configure`. When disabled, `stage` and `count` are no-ops, so the
+hooks can stay in the pipeline code.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# This module is imported by the CLI and the parser on every start, so it
+# sticks to cheap stdlib imports; report helpers import the rest lazily.
+
+
+PROFILE_ENV = "VVC_PROFILE"
+PROFILE_REPORT_ENV = "VVC_PROFILE_REPORT"
+REPORT_VERSION = 1
+TOP_FUNCTIONS = 20
+
+
+class StageStats:
+    __slots__ = ("calls", "total_s", "max_s")
+
+    def __init__(self, calls: int = 0, total_s: float = 0.0, max_s: float = 0.0):
+        self.calls = calls
+        self.total_s = total_s
+        self.max_s = max_s
+
+    def add(self, elapsed: float):
+        self.calls += 1
+        self.total_s += elapsed
+        self.max_s = max(self.max_s, elapsed)
+
+    def merge(self, other: "StageStats"):
+        self.calls += other.calls
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "total_s": self.total_s,
+            "mean_s": self.total_s / self.calls if self.calls else 0.0,
+            "max_s": self.max_s,
+        }
+
+
+class _RawStats:
+    """Adapter letting pstats.Stats load a stats dict received from a worker."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class StageProfiler:
+    def __init__(self, enabled: bool = False, use_cprofile: bool = False):
+        self.configure(enabled, use_cprofile)
+
+    @classmethod
+    def from_env(cls) -> "StageProfiler":
+        mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+        return cls(
+            enabled=mode not in ("", "0", "false", "off"),
+            use_cprofile=mode == "cprofile",
+        )
+
+    @property
+    def mode(self) -> Optional[str]:
+        """None, "timers" or "cprofile", e.g. to hand on to worker processes."""
+        if not self.enabled:
+            return None
+        return "cprofile" if self.use_cprofile else "timers"
+
+    def configure(self, enabled: bool = True, use_cprofile: bool = False):
+        self.enabled = enabled or use_cprofile
+        self.use_cprofile = use_cprofile
+        self.reset()
+
+    def reset(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._profiles: Dict[str, Any] = {}
+        self._merged_stats: Dict[str, List[dict]] = {}
+        self._active_profile = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times the enclosed block and, in cprofile mode, profiles it."""
+        if not self.enabled:
+            yield
+            return
+
+        profile = self._start_profile(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+                self._active_profile = None
+            self.stages.setdefault(name, StageStats()).add(elapsed)
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Picklable stages, counters and raw cProfile stats, e.g. to send from
+        a worker process.
+        """
+        return {
+            "stages": dict(self.stages),
+            "counters": dict(self.counters),
+            "cprofile": {
+                name: self._raw_stats(name) for name in self._profile_names()
+            },
+        }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """Adds a `snapshot` of another profiler to this one."""
+        if not self.enabled:
+            return
+        for name, stats in snapshot["stages"].items():
+            self.stages.setdefault(name, StageStats()).merge(stats)
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+        if self.use_cprofile:
+            for name, raw in snapshot.get("cprofile", {}).items():
+                self._merged_stats.setdefault(name, []).append(raw)
+
+    def _start_profile(self, name: str):
+        # cProfile cannot nest, inner stages are covered by the outer profile
+        if not self.use_cprofile or self._active_profile is not None:
+            return None
+        import cProfile
+
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        self._active_profile = profile
+        profile.enable()
+        return profile
+
+    def _profile_names(self) -> List[str]:
+        return sorted(set(self._profiles) | set(self._merged_stats))
+
+    def _stats(self, name: str):
+        """pstats.Stats of a stage, own profile and merged worker stats combined."""
+        import io
+        import pstats
+
+        sources = [_RawStats(raw) for raw in self._merged_stats.get(name, [])]
+        if name in self._profiles:
+            sources.insert(0, self._profiles[name])
+        return pstats.Stats(*sources, stream=io.StringIO())
+
+    def _raw_stats(self, name: str) -> dict:
+        return self._stats(name).stats
+
+    def _profile_summary(self, name: str) -> list:
+        stats = self._stats(name)
+        rows = []
+        for (filename, line, func), values in stats.stats.items():
+            _, ncalls, tottime, cumtime, _ = values
+            rows.append(
+                {
+                    "function": f"{filename}:{line}({func})",
+                    "ncalls": ncalls,
+                    "tottime_s": tottime,
+                    "cumtime_s": cumtime,
+                }
+            )
+        rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+
+    def report(self) -> Dict[str, Any]:
+        import platform
+
+        report: Dict[str, Any] = {
+            "version": REPORT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "argv": sys.argv,
+            "stages": {name: s.as_dict() for name, s in sorted(self.stages.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        names = self._profile_names()
+        if names:
+            report["cprofile"] = {name: self._profile_summary(name) for name in names}
+        return report
+
+    def write_report(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Writes the report as JSON to `path`, VVC_PROFILE_REPORT or stderr.
+        In cprofile mode the raw stats of each stage are dumped next to the
+        report as `<report>.<stage>.prof`.
+        """
+        if not self.enabled:
+            return None
+        import json
+        from pathlib import Path
+
+        path = path or os.environ.get(PROFILE_REPORT_ENV)
+        content = json.dumps(self.report(), indent=2)
+        if not path:
+            print(content, file=sys.stderr)
+            return None
+
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(content)
+        for name in self._profile_names():
+            self._stats(name).dump_stats(str(report_path.with_suffix(f".{name}.prof")))
+        return str(report_path)
+
+
+PROFILER = StageProfiler.from_env()
@@ -0,0 +1,63 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from features_generator.generator import SequenceFeatureBuilder
+from features_parser.parser import VTMParser
+from profiling.profiler import PROFILER, StageProfiler
+
+
+TRACE = [
+    "BlockStat: POC 0 @(   0,   0) [ 8x 8] QP=22\n",
+    "Irrelevant line\n",
+    "BlockStat: POC 1 @(   0,   0) [ 8x 8] QP=27\n",
+    "BlockStat: POC 1 @(   8,   8) [ 8x 8] MVL0={-4, 12}\n",
+]
+
+
+class TestStageProfiler(unittest.TestCase):
+    def tearDown(self):
+        PROFILER.configure(enabled=False)
+
+    def test_disabled_is_noop(self):
+        profiler = StageProfiler()
+
+        with profiler.stage("parse"):
+            profiler.count("parse.lines", 3)
+
+        self.assertEqual(profiler.stages, {})
+        self.assertEqual(profiler.counters, {})
+        self.assertIsNone(profiler.write_report())
+
+    def test_pipeline_stages_and_counters(self):
+        PROFILER.configure()
+        parser = VTMParser()
+
+        parser.parse(TRACE)
+        grouped = parser.group_on_poc()
+        SequenceFeatureBuilder(16, 16).build(grouped)
+
+        report = PROFILER.report()
+        self.assertEqual(report["stages"]["parse"]["calls"], 1)
+        self.assertEqual(report["stages"]["group_on_poc"]["calls"], 1)
+        self.assertEqual(report["stages"]["paint"]["calls"], 2)
+        self.assertEqual(report["stages"]["build"]["calls"], 1)
+        self.assertEqual(report["counters"]["parse.lines"], 4)
+        self.assertEqual(report["counters"]["parse.tokens.QP"], 2)
+        self.assertEqual(report["counters"]["parse.tokens.MVL0"], 1)
+        self.assertEqual(report["counters"]["paint.blocks"], 3)
+        self.assertNotIn("cprofile", report)
+
+    def test_cprofile_report(self):
+        PROFILER.configure(use_cprofile=True)
+
+        VTMParser().parse(TRACE)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = PROFILER.write_report(str(Path(tmp) / "report.json"))
+            report = json.loads(Path(path).read_text())
+
+            self.assertIn("parse", report["cprofile"])
+            self.assertTrue(report["cprofile"]["parse"])
+            self.assertTrue((Path(tmp) / "report.parse.prof").is_file())
@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+MB = 1024 * 1024
+
+# Relative cost of vvenc presets, "fast" is the reference.
+PRESET_FACTORS: Dict[str, float] = {
+    "faster": 0.7,
+    "fast": 1.0,
+    "medium": 1.5,
+    "slow": 2.0,
+    "slower": 2.5,
+}
+
+
+@dataclass
+class MemoryModel:
+    """Linear model of peak RSS of an external tool."""
+
+    base_bytes: int
+    bytes_per_pixel: float
+    bytes_per_frame_pixel: float = 0.0
+
+    def estimate(self, width: int, height: int, frames: int, preset: str = "") -> int:
+        pixels = width * height
+        per_pixel = self.bytes_per_pixel * PRESET_FACTORS.get(preset, 1.0)
+        return int(
+            self.base_bytes + pixels * (per_pixel + self.bytes_per_frame_pixel * frames)
+        )
+
+
+# Rough defaults, refined at runtime by observed peak RSS.
+VVENC_MODEL = MemoryModel(base_bytes=64 * MB, bytes_per_pixel=300.0)
+VTM_DECODER_MODEL = MemoryModel(
+    base_bytes=32 * MB, bytes_per_pixel=120.0, bytes_per_frame_pixel=2.0
+)
+
+# Used when the resolution of a task is unknown, 1080p sized frame.
+FALLBACK_RESOLUTION: Tuple[int, int] = (1920, 1080)
+
+
+@dataclass
+class MemoryEstimator:
+    """
+    Estimates per-task memory from a `MemoryModel`, corrected by the ratio
+    of observed peak RSS to the model estimate of earlier runs. Ratios are
+    kept per tool and preset and persisted to `history_path` if given.
+    """
+
+    tool: str
+    model: MemoryModel
+    history_path: Optional[str] = None
+    safety_margin: float = 1.1
+    smoothing: float = 0.5
+    ratios: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.history_path and Path(self.history_path).is_file():
+            history = json.loads(Path(self.history_path).read_text())
+            self.ratios.update(history.get(self.tool, {}))
+
+    def _model_estimate(self, width: int, height: int, frames: int, preset: str) -> int:
+        if not width or not height:
+            width, height = FALLBACK_RESOLUTION
+        return self.model.estimate(width, height, frames, preset)
+
+    def estimate(self, width: int, height: int, frames: int, preset: str = "") -> int:
+        ratio = self.ratios.get(preset, 1.0)
+        model = self._model_estimate(width, height, frames, preset)
+        return int(model * ratio * self.safety_margin)
+
+    def observe(
+        self, width: int, height: int, frames: int, preset: str, peak_rss: int
+    ):
+        """
+        Updates the correction ratio with a measured peak RSS in bytes.
+        Tasks of unknown resolution are ignored, their estimate is based on
+        the fallback resolution and would skew the ratio.
+        """
+        if peak_rss <= 0 or not width or not height:
+            return
+        ratio = peak_rss / self._model_estimate(width, height, frames, preset)
+        previous = self.ratios.get(preset)
+        if previous is not None:
+            ratio = self.smoothing * previous + (1 - self.smoothing) * ratio
+        self.ratios[preset] = ratio
+
+    def save(self):
+        if not self.history_path:
+            return
+        path = Path(self.history_path)
+        history = json.loads(path.read_text()) if path.is_file() else {}
+        history[self.tool] = self.ratios
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(history, indent=2))
+
+
+@dataclass
+class TaskOutcome:
+    result: Any
+    peak_rss: int
+
+
+def _children_peak_rss() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measured_call(fn: Callable[[Any], Any], task: Any) -> TaskOutcome:
+    """
+    Runs `fn(task)` in a worker and reports the peak RSS of the external
+    processes it spawned.
+    """
+    result = fn(task)
+    return TaskOutcome(result=result, peak_rss=_children_peak_rss())
+
+
+def _executor_kwargs() -> Dict[str, Any]:
+    # A fresh worker per task makes RUSAGE_CHILDREN a per-task measurement.
+    # Older interpreters reuse workers, so the value is an upper bound.
+    if sys.version_info >= (3, 11):
+        return {"max_tasks_per_child": 1}
+    return {}
+
+
+@dataclass
+class MemoryBudgetScheduler:
+    """
+    Runs tasks in a process pool, admitting a task only while the sum of
+    estimates of running tasks fits in `budget_bytes`. Pending tasks are
+    ordered largest first (LPT) to shorten the makespan; when the largest
+    one does not fit, smaller ones may fill the remaining budget.
+    A task larger than the whole budget runs alone.
+    """
+
+    max_workers: Optional[int] = os.cpu_count()
+    budget_bytes: Optional[int] = None
+    admitted: List[int] = field(default_factory=list)
+    peak_reserved: int = 0
+
+    def run(
+        self, fn: Callable[[Any], Any], tasks: Sequence[Any], estimates: Sequence[int]
+    ) -> List[TaskOutcome]:
+        """Returns outcomes in the order of `tasks`."""
+        max_workers = self.max_workers or os.cpu_count() or 1
+        budget = self.budget_bytes if self.budget_bytes else float("inf")
+        pending = sorted(range(len(tasks)), key=lambda i: estimates[i], reverse=True)
+        outcomes: List[Optional[TaskOutcome]] = [None] * len(tasks)
+        running: Dict[Future, int] = {}
+        reserved = 0
+
+        with ProcessPoolExecutor(max_workers=max_workers, **_executor_kwargs()) as executor:
+            while pending or running:
+                while pending and len(running) < max_workers:
+                    idx = next(
+                        (i for i in pending if reserved + estimates[i] <= budget), None
+                    )
+                    if idx is None and not running:
+                        idx = pending[0]
+                        print(
+                            f"Task {idx} needs {estimates[idx] // MB} MB, "
+                            f"more than the {int(budget) // MB} MB budget; running it alone."
+                        )
+                    if idx is None:
+                        break
+                    pending.remove(idx)
+                    reserved += estimates[idx]
+                    self.admitted.append(idx)
+                    self.peak_reserved = max(self.peak_reserved, reserved)
+                    running[executor.submit(measured_call, fn, tasks[idx])] = idx
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx = running.pop(future)
+                    reserved -= estimates[idx]
+                    outcomes[idx] = future.result()
+
+        return outcomes
@@ -0,0 +1,90 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scheduler.memory import (
+    MB,
+    MemoryBudgetScheduler,
+    MemoryEstimator,
+    MemoryModel,
+)
+
+
+def double(x):
+    return x * 2
+
+
+class TestMemoryEstimator(unittest.TestCase):
+    def setUp(self):
+        self.model = MemoryModel(base_bytes=10 * MB, bytes_per_pixel=100.0)
+
+    def test_estimate_scales_with_resolution_and_preset(self):
+        estimator = MemoryEstimator("vvenc", self.model, safety_margin=1.0)
+
+        cif = estimator.estimate(352, 288, 64, "fast")
+        uhd = estimator.estimate(3840, 2160, 64, "fast")
+        slow = estimator.estimate(352, 288, 64, "slow")
+
+        self.assertEqual(cif, 10 * MB + 352 * 288 * 100)
+        self.assertGreater(uhd, 30 * cif)
+        self.assertGreater(slow, cif)
+
+    def test_observation_refines_estimate(self):
+        estimator = MemoryEstimator("vvenc", self.model, safety_margin=1.0)
+        before = estimator.estimate(352, 288, 64, "fast")
+
+        estimator.observe(352, 288, 64, "fast", peak_rss=before * 3)
+
+        self.assertEqual(estimator.estimate(352, 288, 64, "fast"), before * 3)
+        self.assertEqual(
+            estimator.estimate(352, 288, 64, "medium"),
+            self.model.estimate(352, 288, 64, "medium"),
+        )
+
+    def test_unknown_resolution_is_not_observed(self):
+        estimator = MemoryEstimator("vtm", self.model)
+
+        estimator.observe(0, 0, 64, "", peak_rss=500 * MB)
+
+        self.assertEqual(estimator.ratios, {})
+
+    def test_history_is_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history = str(Path(tmp) / "history.json")
+            estimator = MemoryEstimator("vvenc", self.model, history_path=history)
+            estimator.observe(352, 288, 64, "fast", peak_rss=200 * MB)
+            estimator.save()
+
+            reloaded = MemoryEstimator("vvenc", self.model, history_path=history)
+            other_tool = MemoryEstimator("vtm", self.model, history_path=history)
+
+            self.assertEqual(reloaded.ratios, estimator.ratios)
+            self.assertEqual(other_tool.ratios, {})
+
+
+class TestMemoryBudgetScheduler(unittest.TestCase):
+    def test_results_keep_task_order(self):
+        scheduler = MemoryBudgetScheduler(max_workers=2)
+
+        outcomes = scheduler.run(double, [1, 2, 3], [1, 3, 2])
+
+        self.assertEqual([o.result for o in outcomes], [2, 4, 6])
+        self.assertEqual(scheduler.admitted, [1, 2, 0])
+
+    def test_budget_limits_concurrency(self):
+        scheduler = MemoryBudgetScheduler(max_workers=4, budget_bytes=10 * MB)
+        estimates = [6 * MB, 5 * MB, 4 * MB, 3 * MB]
+
+        outcomes = scheduler.run(double, [1, 2, 3, 4], estimates)
+
+        self.assertEqual([o.result for o in outcomes], [2, 4, 6, 8])
+        self.assertLessEqual(scheduler.peak_reserved, 10 * MB)
+        self.assertEqual(scheduler.admitted[0], 0)
+
+    def test_oversized_task_runs_alone(self):
+        scheduler = MemoryBudgetScheduler(max_workers=2, budget_bytes=1 * MB)
+
+        outcomes = scheduler.run(double, [5, 6], [4 * MB, 2 * MB])
+
+        self.assertEqual([o.result for o in outcomes], [10, 12])
+        self.assertEqual(scheduler.peak_reserved, 4 * MB)